@@ -1,279 +1,433 @@
-import asyncio
-import multiprocessing
-from strategies.bollinger_mean_reversion import Bollinger_Mean_Reversion
-from strategies.volume_fade import Volume_Fade
-import json
-from positions_manager import PositionsManager
-from multiprocessing import Manager
-
-STRATEGY_MAP = {
-    "BollingerMeanReversion": Bollinger_Mean_Reversion(),
-    "VolumeFade": Volume_Fade(),
-    # Add more strategies here easily
-}
-
-# -------- PUB-SUB MANAGER --------
-def pubsub_manager(queue, subscriber_queues):
-    while True:
-        data = queue.get()
-        if data == "EOD":
-            print("[Manager] Received EOD. Shutting down.")
-            for sub_q in subscriber_queues:
-                sub_q.put("EOD")
-            break
-        #print(f"[Manager] Broadcasting: {data}")
-        for sub_q in subscriber_queues:
-            sub_q.put(data)
-
-# -------- POSITIONS MANAGER PROCESS --------
-def positions_manager_worker(positions_queue, shared_positions, shared_prices, shared_trade_log, shared_realized_pnl, shared_pnl_lock):
-    """Dedicated process for handling all position and price updates"""
-    
-    positions_manager = PositionsManager(
-        shared_positions=shared_positions,
-        shared_prices=shared_prices,
-        shared_trade_log=shared_trade_log,
-        shared_realized_pnl=shared_realized_pnl,
-        shared_pnl_lock=shared_pnl_lock
-    )
-    
-    print("[PositionsManager] Started positions manager process.")
-    
-    while True:
-        data = positions_queue.get()
-        if data == "EOD" or (isinstance(data, dict) and data.get("action") == "EOD"):
-            print("[PositionsManager] Received EOD. Exiting.")
-            break
-            
-        action = data['action']
-        
-        if action == 'update_price':
-            identifier = data['identifier']
-            price = data['price']
-            # This will update price and trigger auto-close if needed
-            positions_manager.update_market_price(identifier, price)
-            
-        elif action == 'open_position':
-            identifier = data['identifier']
-            signal = data['signal']
-            price = data['price']
-            target = data['target']
-            stop_loss = data['stop_loss']
-            strategy_name = data.get('strategy_name', 'Unknown')
-            positions_manager.update_position(identifier, signal, price, target, stop_loss)
-            print(f"[PositionsManager] Opened position for {strategy_name}: {identifier} {signal} at {price}")
-
-# -------- SUBSCRIBERS --------
-def subscriber_worker(name, sub_queue, positions_queue):
-    
-    strategy = STRATEGY_MAP.get(name)
-
-    if strategy is None:
-        print(f"Unknown strategy name: {name}")
-        return
-
-    print(f"[{name}] Strategy worker started.")
-
-    while True:
-        data = sub_queue.get()
-        if data == "EOD":
-            print(f"[{name}] Received EOD. Exiting.")
-            break
-
-        data = json.loads(data)
-
-        try:
-            price = float(data['CLOSE PRICE '])
-            identifier = data['SYMBOL ']
-            date = data['DATE ']
-            expiry = data['EXPIRY DATE ']
-            option_type = data['OPTION TYPE ']
-            
-            open_price = float(data['OPEN PRICE '])
-            close_price = float(data['CLOSE PRICE '])
-            volume = float(data['Volume '])
-            open_interest = float(data['OPEN INTEREST '])
-            change_in_oi = float(data['CHANGE IN OI '])
-            
-            rec_date = data['REC DATE ']
-
-        except Exception as e:
-            print(f"[{name}] Error parsing data: {e}")
-            continue
-
-        # Send price update to positions manager (centralized)
-        positions_queue.put({
-            'action': 'update_price',
-            'identifier': identifier,
-            'price': price
-        })
-
-        # Process strategy logic
-        result = strategy.process(close_price, date, expiry, option_type, open_price, volume, open_interest, change_in_oi)
-        if result is None:
-            continue
-        signal, target, stop_loss = result
-
-        if signal:
-            # Send position update to positions manager (centralized)
-            positions_queue.put({
-                'action': 'open_position',
-                'identifier': identifier,
-                'signal': signal,
-                'price': price,
-                'target': target,
-                'stop_loss': stop_loss,
-                'strategy_name': name
-            })
-            print(f"[{name}] Generated signal: {identifier}, {signal}, Target: {target}, Stop: {stop_loss} at {rec_date}")
-
-
-# -------- ASYNC SOCKET CLIENT --------
-async def socket_reader(host, port, publish_queue):
-    
-    #Asynchronous client to connect to the data server and push data to the publish queue.
-    #Includes robust error handling and explicit resource cleanup for async operations.
-    
-    reader = None # Initialize to None for finally block
-    writer = None # Initialize to None for finally block
-    
-    try:
-        reader, writer = await asyncio.open_connection(host, port)
-        print(f"[Socket Client] Connected to {host}:{port}")
-
-        while True:
-            line = await reader.readline()
-            if not line:
-                # This often means the server closed the connection or there's no more data
-                print("[Socket Client] Server closed the connection or no more data (empty read).")
-                break # Exit loop if connection is closed from server side
-            
-            decoded = line.decode().strip()
-            # print(f"[Socket Client] Received: {decoded}") # Uncomment for verbose output
-            
-            publish_queue.put(decoded) # Put the data into the multiprocessing Queue
-
-            if decoded == "EOD":
-                print("[Socket Client] Received EOD signal. Closing connection.")
-                break # Signal end of data stream, exit loop
-                
-    except ConnectionRefusedError:
-        print(f"[Socket Client ERROR] Connection refused. Is the data server running on {host}:{port}?")
-    except asyncio.CancelledError:
-        print("[Socket Client] Task was cancelled. Shutting down gracefully.")
-    except Exception as e:
-        print(f"[Socket Client ERROR] An unexpected error occurred: {e}")
-    finally:
-        # Ensure resources are properly closed, even if errors occur
-        if writer: # Check if writer object was successfully created
-            try:
-                writer.close()
-                await writer.wait_closed() # Wait for the writer/transport to close gracefully
-                print("[Socket Client] Writer closed successfully.")
-            except Exception as e:
-                print(f"[Socket Client ERROR] Error closing writer: {e}")
-        
-        # If reader exists and connection is still open (though writer.close should handle),
-        # ensure it's closed.
-        if reader and not reader.at_eof(): # at_eof() checks if end-of-file was reached (connection closed)
-             try:
-                 reader.feed_eof() # Signal EOF to the reader protocol
-                 # You might not need explicit reader.close() if writer.close() handles the transport
-                 # but including for robustness.
-                 print("[Socket Client] Reader signaled EOF.")
-             except Exception as e:
-                 print(f"[Socket Client ERROR] Error handling reader EOF: {e}")
-        
-        print("[Socket Client] Disconnected from server.")
-
-# -------- MAIN --------
-def main():
-    host = "127.0.0.1"
-    port = 65432  
-
-    # Shared multiprocessing Manager
-    mp_manager = Manager()
-    
-    # Create shared data structures ONCE
-    shared_positions = mp_manager.dict()
-    shared_prices = mp_manager.dict()
-    shared_trade_log = mp_manager.list()
-    shared_realized_pnl = mp_manager.Value('d', 0.0)
-    shared_pnl_lock = mp_manager.Lock()
-
-    # Queues
-    publish_queue = multiprocessing.Queue()
-    positions_queue = multiprocessing.Queue()  # New queue for position updates
-    sub_q1 = multiprocessing.Queue()
-    sub_q2 = multiprocessing.Queue()
-    subscriber_queues = [sub_q1, sub_q2]
-
-    # Pub-sub manager process
-    manager_process = multiprocessing.Process(
-        target=pubsub_manager, args=(publish_queue, subscriber_queues)
-    )
-    manager_process.start()
-
-    # Positions manager process (NEW)
-    positions_process = multiprocessing.Process(
-        target=positions_manager_worker, 
-        args=(positions_queue, shared_positions, shared_prices, shared_trade_log, shared_realized_pnl, shared_pnl_lock)
-    )
-    positions_process.start()
-
-    # Subscribers - now only pass positions_queue
-    sub1 = multiprocessing.Process(target=subscriber_worker, args=("BollingerMeanReversion", sub_q1, positions_queue))
-    sub2 = multiprocessing.Process(target=subscriber_worker, args=("VolumeFade", sub_q2, positions_queue))
-    sub1.start()
-    sub2.start()
-
-    # Async socket reader (main process)
-    asyncio.run(socket_reader(host, port, publish_queue))
-
-    # Wait for all strategy processes to finish processing
-    sub1.join()
-    sub2.join()
-    print("[Main] All strategy processes completed.")
-
-    # Now signal EOD to positions manager after strategies are done
-    positions_queue.put("EOD")
-    print("[Main] Sent EOD signal to positions manager.")
-
-    # Join remaining processes
-    manager_process.join()
-    positions_process.join()
-    print("[Main] All processes joined.")
-
-    # Create PositionsManager instance in main process using the same shared data
-    positions_manager = PositionsManager(
-        shared_positions=shared_positions,
-        shared_prices=shared_prices,
-        shared_trade_log=shared_trade_log,
-        shared_realized_pnl=shared_realized_pnl,
-        shared_pnl_lock=shared_pnl_lock
-    )
-    
-    # Debug information
-    print(f"[Debug] Shared trade log length: {len(shared_trade_log)}")
-    print(f"[Debug] Shared realized PnL: {shared_realized_pnl.value}")
-    
-    temp = "\n"*2
-    print(temp+"[Trade Log Summary]")
-    trade_log = positions_manager.get_trade_log()
-    
-    if not trade_log:
-        print("No trades executed.")
-    else:
-        print(f"Total trades: {len(trade_log)}")
-        print(f"Total realized PnL: {positions_manager.get_realized_pnl():.2f}")
-        print("-" * 80)
-        
-        for trade in trade_log:
-            print(f"{trade['identifier']} {trade['side']} | Entry: {trade['entry']:.2f} | Exit: {trade['exit']:.2f} | PnL: {trade['pnl']:.2f}")
-
-    temp = "\n"*5
-    print(temp+"[Main] All processes exited cleanly.")
-
-if __name__ == "__main__":
-    multiprocessing.set_start_method("spawn")
-    main()
\ No newline at end of file
+import asyncio
+import logging
+import multiprocessing
+import os
+from strategies.bollinger_mean_reversion import Bollinger_Mean_Reversion
+from strategies.volume_fade import Volume_Fade
+import socket
+import struct
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+
+# orjson decodes JSON several times faster than the stdlib; fall back
+# to the stdlib when it isn't installed.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# uvloop's libuv-based loop dispatches small socket reads 2-4x faster than
+# the default selector loop; optional like orjson.
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+from positions_manager import (
+    MAX_SYMBOLS, MAX_SYMBOL_LEN, PositionsManager, RECORD, RECORD_SIZE,
+    REGISTER_RECORD, REC_PRICE, REC_OPEN, REC_EOD, REC_REGISTER,
+)
+from ring_buffer import BroadcastRing, SPSCRing
+from log_setup import init_worker, start_listener
+import time
+
+log = logging.getLogger(__name__)
+
+STRATEGY_MAP = {
+    "BollingerMeanReversion": Bollinger_Mean_Reversion(),
+    "VolumeFade": Volume_Fade(),
+    # Add more strategies here easily
+}
+
+# Instrument universe known at startup; the symbol-id table for all
+# shared-memory indexing is built from this list once.
+SYMBOLS = ["NIFTY_CE250500_31072025"]
+
+RING_CAPACITY = 4096
+
+# Fixed binary tick record broadcast to subscribers: kind byte, symbol id,
+# option type, the three date strings, then the numeric fields already
+# parsed to doubles (open, close, volume, open interest, change in OI,
+# and the feed timestamp as epoch seconds).
+TICK_RECORD = struct.Struct('<BH2s10s10s19s6d')
+TICK_RECORD_SIZE = TICK_RECORD.size
+
+# Field names for an unpacked TICK_RECORD: attribute access instead of
+# string-keyed dict lookups (or bare tuple indices) on every tick.
+Tick = namedtuple('Tick', [
+    'kind', 'sid', 'option_type', 'date', 'expiry', 'rec_date',
+    'open', 'close', 'volume', 'open_interest', 'change_in_oi', 'event_time',
+])
+
+MD_TICK = 0
+MD_EOD = 1
+MD_REGISTER = 2
+
+# Control record announcing a symbol-id assignment; same slot size as ticks.
+MD_REGISTER_RECORD = struct.Struct(f'<BH{TICK_RECORD_SIZE - 3}s')
+assert MD_REGISTER_RECORD.size == TICK_RECORD_SIZE
+
+_EOD_TICK = TICK_RECORD.pack(MD_EOD, 0, b'', b'', b'', b'', 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+
+def pack_tick(tick: dict, sid: int) -> bytes:
+    """Packs one decoded tick into a TICK_RECORD, once for all subscribers.
+    The feed timestamp is parsed to epoch seconds here so no downstream
+    stage ever touches a clock or a date string on the hot path."""
+    rec_date = tick['REC DATE ']
+    return TICK_RECORD.pack(
+        MD_TICK,
+        sid,
+        tick['OPTION TYPE '].encode(),
+        tick['DATE '].encode(),
+        tick['EXPIRY DATE '].encode(),
+        rec_date.encode(),
+        float(tick['OPEN PRICE ']),
+        float(tick['CLOSE PRICE ']),
+        float(tick['Volume ']),
+        float(tick['OPEN INTEREST ']),
+        float(tick['CHANGE IN OI ']),
+        datetime.fromisoformat(rec_date).timestamp(),
+    )
+
+
+# -------- POSITIONS MANAGER PROCESS --------
+def positions_manager_worker(positions_manager, positions_rings, log_queue):
+    """Dedicated process for handling all position and price updates"""
+
+    init_worker(log_queue)
+    print("[PositionsManager] Started positions manager process.")
+
+    # Single consumer of all subscriber rings; sole writer of positions,
+    # trade log and realized PnL.
+    pending_eod = len(positions_rings)
+    while pending_eod > 0:
+        idle = True
+        for ring in positions_rings:
+            record = ring.try_pop()
+            if record is None:
+                continue
+            idle = False
+            if record[0] == REC_REGISTER:
+                _, _, sid, raw = REGISTER_RECORD.unpack(record)
+                positions_manager.register_symbol(sid, raw.rstrip(b'\x00').decode())
+                continue
+            kind, side, sid, price, target, stop_loss, event_time = RECORD.unpack(record)
+            identifier = positions_manager.symbols[sid] if kind != REC_EOD else None
+
+            if kind == REC_PRICE:
+                # This will update price and trigger auto-close if needed
+                positions_manager.update_market_price(identifier, price, event_time=event_time)
+            elif kind == REC_OPEN:
+                positions_manager.update_position(identifier, side, price, target, stop_loss,
+                                                  event_time=event_time)
+            elif kind == REC_EOD:
+                pending_eod -= 1
+        if idle:
+            time.sleep(0.0005)
+
+    print("[PositionsManager] Received EOD from all subscribers. Exiting.")
+    positions_manager.close()
+
+# -------- SUBSCRIBERS --------
+def _process_tick_batch(name, strategy, ticks, positions_ring, symbols):
+    """Evaluates a batch of unpacked tick tuples with one kernel call, then
+    emits price updates and any open-position records in tick order."""
+    closes = np.array([t.close for t in ticks], np.float64)
+    opens = np.array([t.open for t in ticks], np.float64)
+    volumes = np.array([t.volume for t in ticks], np.float64)
+    open_interests = np.array([t.open_interest for t in ticks], np.float64)
+    changes_in_oi = np.array([t.change_in_oi for t in ticks], np.float64)
+    is_ce = np.array([1 if t.option_type == b'CE' else 0 for t in ticks], np.uint8)
+
+    signals, targets, stops = strategy.process_batch(
+        closes, opens, volumes, open_interests, changes_in_oi, is_ce)
+
+    for i, tick in enumerate(ticks):
+        sid = tick.sid
+        price = float(closes[i])
+
+        # Send price update to positions manager (lock-free SPSC ring)
+        positions_ring.push(RECORD.pack(REC_PRICE, 0, sid, price, 0.0, 0.0, tick.event_time))
+
+        side = int(signals[i])
+        if side:
+            target = float(targets[i])
+            stop_loss = float(stops[i])
+            # Send position update to positions manager (lock-free SPSC ring)
+            positions_ring.push(RECORD.pack(REC_OPEN, side, sid, price, target, stop_loss, tick.event_time))
+            log.info("[%s] Generated signal: %s, %s, Target: %s, Stop: %s at %s",
+                     name, symbols[sid], "BUY" if side > 0 else "SELL", target, stop_loss,
+                     tick.rec_date.decode())
+
+
+def subscriber_worker(name, md_ring, consumer, positions_ring, symbols, log_queue):
+
+    init_worker(log_queue)
+    strategy = STRATEGY_MAP.get(name)
+
+    if strategy is None:
+        print(f"Unknown strategy name: {name}")
+        return
+
+    print(f"[{name}] Strategy worker started.")
+
+    pending = []
+    eod = False
+    while True:
+        record = md_ring.try_pop(consumer)
+        if record is not None:
+            kind = record[0]
+            if kind == MD_EOD:
+                eod = True
+            elif kind == MD_REGISTER:
+                # Extend the local symbol table and let the positions
+                # manager know before any tick for this sid arrives.
+                _, sid, raw = MD_REGISTER_RECORD.unpack(record)
+                symbol = raw.rstrip(b'\x00').decode()
+                while len(symbols) <= sid:
+                    symbols.append(None)
+                symbols[sid] = symbol
+                positions_ring.push(REGISTER_RECORD.pack(REC_REGISTER, 0, sid, raw[:MAX_SYMBOL_LEN]))
+            else:
+                pending.append(Tick._make(TICK_RECORD.unpack(record)))
+
+        # Evaluate once the ring runs dry, EOD arrives, or the batch fills;
+        # while data keeps flowing we just keep accumulating.
+        if pending and (record is None or eod or len(pending) >= PUBLISH_BATCH):
+            _process_tick_batch(name, strategy, pending, positions_ring, symbols)
+            pending.clear()
+
+        if eod:
+            print(f"[{name}] Received EOD. Exiting.")
+            positions_ring.push(RECORD.pack(REC_EOD, 0, 0, 0.0, 0.0, 0.0, 0.0))
+            break
+
+        if record is None:
+            time.sleep(0.0005)
+
+
+RECV_BUFFER_SIZE = 65536
+
+# Parsed records accumulated per socket read; one queue put ships the whole
+# batch, so IPC cost is amortized over up to PUBLISH_BATCH ticks.
+PUBLISH_BATCH = 256
+
+
+def _handle_line(line: bytes, batch, positions_manager) -> bool:
+    """Packs one complete feed line into the batch. Returns True when it was the EOD marker."""
+    if line == b'EOD':
+        batch.append(_EOD_TICK)
+        print("[Socket Client] Received EOD signal. Closing connection.")
+        return True
+
+    # Parse exactly once here; downstream stages only see the
+    # packed binary record.
+    try:
+        tick = json_loads(line)
+        symbol = tick['SYMBOL ']
+        sid = positions_manager.symbol_ids.get(symbol)
+        if sid is None:
+            # First observation of this symbol: assign the next id,
+            # record it in this process's symbol table (main reads the
+            # trade log by sid at the end), and announce it downstream
+            # before the tick itself.
+            if len(symbol.encode()) > MAX_SYMBOL_LEN:
+                print(f"[Socket Client] Symbol {symbol} exceeds {MAX_SYMBOL_LEN} bytes, dropping")
+                return False
+            sid = len(positions_manager.symbol_ids)
+            if sid >= MAX_SYMBOLS:
+                print(f"[Socket Client] Symbol table full, dropping {symbol}")
+                return False
+            positions_manager.register_symbol(sid, symbol)
+            batch.append(MD_REGISTER_RECORD.pack(MD_REGISTER, sid, symbol.encode()))
+            print(f"[Socket Client] Registered new symbol {symbol} as id {sid}")
+        batch.append(pack_tick(tick, sid))
+    except Exception as e:
+        print(f"[Socket Client] Error parsing data: {e}")
+    return False
+
+
+def _flush_batch(batch, md_ring):
+    if batch:
+        for record in batch:
+            md_ring.push(record)
+        batch.clear()
+
+
+# -------- ASYNC SOCKET CLIENT --------
+async def socket_reader(host, port, md_ring, positions_manager):
+
+    # Asynchronous client to connect to the data server and publish ticks
+    # straight into the broadcast ring. Reads with sock_recv_into on a
+    # preallocated buffer and scans for newlines in place — no StreamReader,
+    # no per-line re-copying.
+
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setblocking(False)
+
+    buf = bytearray(RECV_BUFFER_SIZE)
+    mv = memoryview(buf)
+    tail = 0  # bytes buffered but not yet dispatched
+    batch = []
+
+    try:
+        await loop.sock_connect(sock, (host, port))
+        print(f"[Socket Client] Connected to {host}:{port}")
+
+        while True:
+            n = await loop.sock_recv_into(sock, mv[tail:])
+            if n == 0:
+                # Server closed the connection; any residual bytes are the
+                # final (newline-less) line, e.g. the EOD marker.
+                if tail:
+                    _handle_line(bytes(mv[:tail]).strip(), batch, positions_manager)
+                else:
+                    print("[Socket Client] Server closed the connection or no more data (empty read).")
+                break
+            tail += n
+
+            # Pack every complete line sitting in the buffer into the batch.
+            head = 0
+            eod = False
+            while True:
+                nl = buf.find(b'\n', head, tail)
+                if nl < 0:
+                    break
+                eod = _handle_line(bytes(mv[head:nl]).strip(), batch, positions_manager)
+                head = nl + 1
+                if eod or len(batch) >= PUBLISH_BATCH:
+                    _flush_batch(batch, md_ring)
+                if eod:
+                    break
+            if eod:
+                break
+
+            # Ship whatever this read produced; don't sit on partial batches.
+            _flush_batch(batch, md_ring)
+
+            # Shift the partial trailing line to the front of the buffer.
+            if head:
+                remaining = tail - head
+                if remaining:
+                    buf[:remaining] = buf[head:tail]
+                tail = remaining
+            elif tail == RECV_BUFFER_SIZE:
+                print("[Socket Client ERROR] Line exceeds receive buffer; dropping buffered data.")
+                tail = 0
+
+        _flush_batch(batch, md_ring)
+
+    except ConnectionRefusedError:
+        print(f"[Socket Client ERROR] Connection refused. Is the data server running on {host}:{port}?")
+    except asyncio.CancelledError:
+        print("[Socket Client] Task was cancelled. Shutting down gracefully.")
+    except Exception as e:
+        print(f"[Socket Client ERROR] An unexpected error occurred: {e}")
+    finally:
+        # Ensure the raw socket is closed, even if errors occur
+        try:
+            sock.close()
+        except Exception as e:
+            print(f"[Socket Client ERROR] Error closing socket: {e}")
+
+        print("[Socket Client] Disconnected from server.")
+
+def _pin_to_core(pid: int, core: int):
+    """Best-effort CPU pinning so each ring's producer/consumer pair stays
+    on fixed cores and the cursor cache lines stop ping-ponging. A no-op on
+    platforms without sched_setaffinity or when the core doesn't exist."""
+    try:
+        os.sched_setaffinity(pid, {core % os.cpu_count()})
+    except (AttributeError, OSError):
+        pass
+
+
+# -------- MAIN --------
+def main():
+    host = "127.0.0.1"
+    port = 65432
+
+    # Shared-memory position book, created ONCE and reattached by workers
+    positions_manager = PositionsManager(SYMBOLS)
+
+    # Hot-path log records from all workers funnel through one queue to a
+    # listener thread here; emitting a record never blocks on stdout.
+    log_queue, log_listener = start_listener()
+
+    # Raw feed from the socket reader into the pub-sub manager
+    subscriber_names = ["BollingerMeanReversion", "VolumeFade"]
+
+    # One broadcast ring written by the socket reader; each subscriber
+    # tracks its own cursor, so there is no fan-out hop at all.
+    md_ring = BroadcastRing(TICK_RECORD_SIZE, RING_CAPACITY, len(subscriber_names))
+
+    # Per-subscriber lock-free SPSC rings for position events
+    positions_rings = [SPSCRing(RECORD_SIZE, RING_CAPACITY) for _ in subscriber_names]
+
+    # Positions manager process: single consumer of the rings
+    positions_process = multiprocessing.Process(
+        target=positions_manager_worker,
+        args=(positions_manager, positions_rings, log_queue)
+    )
+    positions_process.start()
+
+    # Subscribers consume their own market-data ring, publish to their own
+    # positions ring — every ring stays strictly single-producer/single-consumer
+    sub1 = multiprocessing.Process(target=subscriber_worker, args=(subscriber_names[0], md_ring, 0, positions_rings[0], positions_manager.symbols, log_queue))
+    sub2 = multiprocessing.Process(target=subscriber_worker, args=(subscriber_names[1], md_ring, 1, positions_rings[1], positions_manager.symbols, log_queue))
+    sub1.start()
+    sub2.start()
+
+    # Socket reader on core 0, positions manager isolated on core 1,
+    # one core per subscriber after that.
+    _pin_to_core(os.getpid(), 0)
+    _pin_to_core(positions_process.pid, 1)
+    _pin_to_core(sub1.pid, 2)
+    _pin_to_core(sub2.pid, 3)
+
+    # Async socket reader (main process)
+    if uvloop is not None:
+        uvloop.install()
+    asyncio.run(socket_reader(host, port, md_ring, positions_manager))
+
+    # Wait for all strategy processes to finish processing
+    sub1.join()
+    sub2.join()
+    print("[Main] All strategy processes completed.")
+
+    # Positions manager exits once every subscriber ring delivered EOD;
+    # the trade log lives in shared memory, so just read it here.
+    positions_process.join()
+    log_listener.stop()
+    print("[Main] All processes joined.")
+    trade_log = positions_manager.get_trade_log()
+
+    temp = "\n"*2
+    print(temp+"[Trade Log Summary]")
+
+    if not trade_log:
+        print("No trades executed.")
+    else:
+        print(f"Total trades: {len(trade_log)}")
+        print(f"Total realized PnL: {positions_manager.get_realized_pnl():.2f}")
+        print("-" * 80)
+
+        for trade in trade_log:
+            print(f"{trade['identifier']} {trade['side']} | Entry: {trade['entry']:.2f} | Exit: {trade['exit']:.2f} | PnL: {trade['pnl']:.2f}")
+
+    # Tear down shared memory
+    positions_manager.close()
+    positions_manager.unlink()
+    for ring in [md_ring] + positions_rings:
+        ring.close()
+        ring.unlink()
+
+    temp = "\n"*5
+    print(temp+"[Main] All processes exited cleanly.")
+
+if __name__ == "__main__":
+    multiprocessing.set_start_method("spawn")
+    main()
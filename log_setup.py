@@ -0,0 +1,26 @@
+import logging
+import logging.handlers
+import multiprocessing
+
+# Hot-path logging: worker processes drop records into a shared queue (a
+# non-blocking put) and a listener thread in the main process does the
+# formatting and stdout I/O, so no tick-path code ever blocks on a flush.
+
+
+def start_listener():
+    """Creates the shared log queue and starts the listener thread that
+    drains it to stdout. Called once, in the main process."""
+    queue = multiprocessing.Queue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(queue, handler)
+    listener.start()
+    return queue, listener
+
+
+def init_worker(queue):
+    """Routes this process's log records into the shared queue. Called at
+    the top of every worker process."""
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(queue)]
+    root.setLevel(logging.INFO)
@@ -1,135 +1,255 @@
-from multiprocessing import Manager, Lock
-from collections import deque
-import time
-
-class PositionsManager:
-
-    def __init__(self, manager=None, shared_positions=None, shared_prices=None, 
-                 shared_trade_log=None, shared_realized_pnl=None, shared_pnl_lock=None):
-        """Initializes the PositionsManager."""
-
-        if manager is None:
-            manager = Manager()
-        
-        # Use provided shared objects or create new ones
-        self.positions = shared_positions if shared_positions is not None else manager.dict()
-        self.prices = shared_prices if shared_prices is not None else manager.dict()
-        self.trade_log = shared_trade_log if shared_trade_log is not None else manager.list()
-        self.realized_pnl = shared_realized_pnl if shared_realized_pnl is not None else manager.Value('d', 0.0)
-        self._pnl_lock = shared_pnl_lock if shared_pnl_lock is not None else manager.Lock()
-
-    def update_market_price(self, identifier: str, price: float, name:str = None):
-        """
-        Updates the current market price for an identifier and triggers auto-closing
-        of positions for that identifier.
-        """
-        self.prices[identifier] = price
-        self._auto_close_positions(identifier)
-
-    def update_position(self, identifier: str, signal: str, price: float, target: float, stop_loss: float):
-        """Opens a new position (long or short) for a given identifier."""
-
-        # Retrieve the deque, convert to a list for local modification.
-        # Use .get() with a default deque() to handle new identifiers gracefully.
-        current_positions_list = list(self.positions.get(identifier, deque()))
-
-        side = "LONG" if signal == "BUY" else "SHORT"
-        pos_data = {
-            "side": side,
-            "entry": price,
-            "target": target,
-            "stop": stop_loss,
-            "open_time": time.time()
-        }
-        current_positions_list.append(pos_data)
-        
-        # Reassign the modified deque (created from the list) back to the manager.dict().
-        # This is crucial for the Manager to synchronize the change.
-        self.positions[identifier] = deque(current_positions_list)
-        
-        print(f"[OPEN] {identifier} {side} entered at {price:.2f} (Target: {target:.2f}, Stop: {stop_loss:.2f})")
-
-    def _auto_close_positions(self, identifier: str):
-        """Automatically closes positions based on current market price hitting target or stop-loss."""
-        
-        if identifier not in self.positions or identifier not in self.prices:
-            return
-
-        price = self.prices[identifier]
-        
-        # Retrieve the deque, convert to a list for safe, local modification.
-        # This creates a local copy to work with.
-        current_positions_list = list(self.positions[identifier]) 
-        
-        closed_trades_info = [] # Temporarily store info for logging and PnL update
-
-        # Iterate through the list. Using a while loop with index for safe removal.
-        i = 0
-        while i < len(current_positions_list):
-            pos = current_positions_list[i]
-            side = pos['side']
-            entry = pos['entry']
-            target = pos['target']
-            stop = pos['stop']
-            open_time = pos['open_time']
-
-            should_close = False
-            if side == "LONG":
-                if price >= target:
-                    #print(f"DEBUG: {identifier} LONG hit TARGET. Price: {price}, Target: {target}")
-                    should_close = True
-                elif price <= stop:
-                    #print(f"DEBUG: {identifier} LONG hit STOP. Price: {price}, Stop: {stop}")
-                    should_close = True
-            elif side == "SHORT":
-                if price <= target: # For short, target is lower than entry
-                    #print(f"DEBUG: {identifier} SHORT hit TARGET. Price: {price}, Target: {target}")
-                    should_close = True
-                elif price >= stop: # For short, stop is higher than entry
-                    #print(f"DEBUG: {identifier} SHORT hit STOP. Price: {price}, Stop: {stop}")
-                    should_close = True
-
-            if should_close:
-                # Remove the position from the local list
-                closed_pos = current_positions_list.pop(i) 
-                close_time = time.time()
-                pnl = self._calculate_pnl(side, entry, price)
-                
-                # Acquire lock before updating the shared realized_pnl value
-                with self._pnl_lock:
-                    self.realized_pnl.value += pnl # Access the shared value with .value
-                
-                trade_info = {
-                    "identifier": identifier,
-                    "side": side,
-                    "entry": entry,
-                    "exit": price,
-                    "pnl": pnl,
-                    "entry_time": open_time,
-                    "exit_time": close_time
-                }
-                self.trade_log.append(trade_info) # manager.list() handles appending atomically
-                closed_trades_info.append(trade_info)
-                # Do NOT increment 'i' here, as the list elements shifted left
-            else:
-                i += 1 # Only move to the next element if no item was removed
-
-        # After all local modifications, reassign the updated deque back to the manager.dict().
-        # This is absolutely essential for changes to be reflected across processes.
-        self.positions[identifier] = deque(current_positions_list)
-
-        for closed in closed_trades_info:
-            print(f"[CLOSE] {closed['identifier']} {closed['side']} exited at {closed['exit']:.2f} (entry: {closed['entry']:.2f}, PnL: {closed['pnl']:.2f})")
-
-    def _calculate_pnl(self, side: str, entry: float, exit: float) -> float:
-        if side == "LONG":
-            return exit - entry
-        elif side == "SHORT":
-            return entry - exit
-        return 0.0
-
-    def get_trade_log(self) -> list:
-        return list(self.trade_log) # Return a copy
-
-    def get_realized_pnl(self) -> float:
-        return self.realized_pnl.value # Access the shared value via .value
\ No newline at end of file
+import logging
+import struct
+import time
+from multiprocessing import shared_memory, RawArray, RawValue
+
+import numpy as np
+
+# Capacity limits for the fixed shared-memory layout. All powers of two
+# so index arithmetic stays cheap.
+MAX_SYMBOLS = 64
+MAX_OPEN_POSITIONS = 256
+MAX_TRADES = 4096
+
+assert MAX_OPEN_POSITIONS & (MAX_OPEN_POSITIONS - 1) == 0, "per-symbol capacity must be a power of two"
+
+# One open position, stored struct-of-arrays style per symbol.
+POSITION_DTYPE = np.dtype([
+    ('side', np.int8),        # +1 = LONG, -1 = SHORT
+    ('entry', np.float64),
+    ('target', np.float64),
+    ('stop', np.float64),
+    ('open_time', np.float64),
+])
+
+# One closed trade in the shared-memory trade log.
+TRADE_DTYPE = np.dtype([
+    ('sid', np.int32),
+    ('side', np.int8),
+    ('entry', np.float64),
+    ('exit', np.float64),
+    ('pnl', np.float64),
+    ('entry_time', np.float64),
+    ('exit_time', np.float64),
+])
+
+# Wire format for records pushed to the positions manager over its SPSC
+# rings: kind, side, symbol id, then price/target/stop/event time. 40 bytes.
+RECORD = struct.Struct('<BbH4xdddd')
+RECORD_SIZE = RECORD.size
+
+REC_PRICE = 0      # (sid, price) market price update
+REC_OPEN = 1       # (sid, side, price, target, stop) new position
+REC_EOD = 2        # end of data from one producer
+REC_REGISTER = 3   # (sid, symbol) symbol first observed on the feed
+
+# Control record announcing a symbol-id assignment; same 40-byte slot.
+# The name field takes all the slack after the header, which bounds how
+# long a symbol can be — registration rejects longer names up front
+# rather than truncating them silently in this table.
+MAX_SYMBOL_LEN = RECORD_SIZE - 4
+REGISTER_RECORD = struct.Struct(f'<BbH{MAX_SYMBOL_LEN}s')
+assert REGISTER_RECORD.size == RECORD_SIZE
+
+LONG = 1
+SHORT = -1
+
+_SIDE_NAMES = {LONG: "LONG", SHORT: "SHORT"}
+
+log = logging.getLogger(__name__)
+
+
+class PositionsManager:
+    """
+    Position book backed by shared memory instead of a multiprocessing
+    Manager. Open positions live in a fixed-size numpy structured array per
+    symbol, prices in a flat double array indexed by symbol id, so a price
+    update is a plain in-process memory write — no pickling, no proxy
+    round-trips. The positions manager process is the single writer of
+    positions and the trade log; other processes only read prices/PnL.
+    """
+
+    def __init__(self, symbols, shm_name=None):
+        """Initializes the PositionsManager for a fixed symbol universe."""
+
+        if len(symbols) > MAX_SYMBOLS:
+            raise ValueError(f"At most {MAX_SYMBOLS} symbols supported")
+
+        # Symbol-id table built once at startup; all hot-path indexing is
+        # integer array indexing from here on.
+        self.symbols = list(symbols)
+        self.symbol_ids = {s: i for i, s in enumerate(self.symbols)}
+
+        # Per-symbol open-position counts, the position rows, then the
+        # fixed-capacity trade log.
+        self._counts_bytes = MAX_SYMBOLS * np.dtype(np.uint32).itemsize
+        self._trades_offset = self._counts_bytes + MAX_SYMBOLS * MAX_OPEN_POSITIONS * POSITION_DTYPE.itemsize
+        size = self._trades_offset + MAX_TRADES * TRADE_DTYPE.itemsize
+        if shm_name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self._owner = True
+            self.shm.buf[:size] = bytes(size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=shm_name)
+            self._owner = False
+        self.shm_name = self.shm.name
+
+        # Live price table shared across processes: one double per symbol.
+        self.prices = RawArray('d', MAX_SYMBOLS)
+
+        # Only the positions manager process ever writes these; an aligned
+        # 8-byte store is atomic, so readers need no lock at all.
+        self.realized_pnl = RawValue('d', 0.0)
+        self.trade_count = RawValue('Q', 0)
+
+        self._build_views()
+
+    def _build_views(self):
+        self.counts = np.ndarray((MAX_SYMBOLS,), dtype=np.uint32, buffer=self.shm.buf)
+        self.positions = np.ndarray(
+            (MAX_SYMBOLS, MAX_OPEN_POSITIONS), dtype=POSITION_DTYPE,
+            buffer=self.shm.buf, offset=self._counts_bytes,
+        )
+        self.trades = np.ndarray(
+            (MAX_TRADES,), dtype=TRADE_DTYPE,
+            buffer=self.shm.buf, offset=self._trades_offset,
+        )
+
+    # -- pickling: worker processes reattach to the same shared memory --
+    def __getstate__(self):
+        return (self.symbols, self.shm_name, self.prices, self.realized_pnl, self.trade_count)
+
+    def __setstate__(self, state):
+        symbols, shm_name, prices, realized_pnl, trade_count = state
+        self.__init__(symbols, shm_name=shm_name)
+        self.prices = prices
+        self.realized_pnl = realized_pnl
+        self.trade_count = trade_count
+
+    def register_symbol(self, sid: int, symbol: str):
+        """
+        Records a symbol-id assignment made at runtime for a symbol first
+        observed on the feed. Idempotent; the rare path by design.
+        """
+        if symbol in self.symbol_ids:
+            return
+        if sid >= MAX_SYMBOLS:
+            log.info("[PositionsManager] Symbol table full, ignoring %s (sid %d)", symbol, sid)
+            return
+        while len(self.symbols) <= sid:
+            self.symbols.append(None)
+        self.symbols[sid] = symbol
+        self.symbol_ids[symbol] = sid
+
+    def update_market_price(self, identifier: str, price: float, name: str = None,
+                            event_time: float = None):
+        """
+        Updates the current market price for an identifier and triggers auto-closing
+        of positions for that identifier. event_time is the feed timestamp of
+        the tick; it defaults to wall-clock time when the caller has none.
+        """
+        if event_time is None:
+            event_time = time.time()
+        sid = self.symbol_ids[identifier]
+        self.prices[sid] = price
+        self._auto_close_positions(sid, price, event_time)
+
+    def update_position(self, identifier: str, side: int, price: float, target: float,
+                        stop_loss: float, event_time: float = None):
+        """
+        Opens a new position (LONG = +1 / SHORT = -1) for a given identifier.
+        O(1) append into the symbol's preallocated buffer — one row write
+        plus a count bump, no allocation and no clock syscall when the
+        caller supplies the feed timestamp.
+        """
+
+        if event_time is None:
+            event_time = time.time()
+        sid = self.symbol_ids[identifier]
+
+        count = self.counts[sid]
+        if count >= MAX_OPEN_POSITIONS:
+            log.info("[OPEN] %s: position buffer full, dropping signal", identifier)
+            return
+        self.positions[sid, count] = (side, price, target, stop_loss, event_time)
+        self.counts[sid] = count + 1
+
+        log.info("[OPEN] %s %s entered at %.2f (Target: %.2f, Stop: %.2f)", identifier, _SIDE_NAMES[side], price, target, stop_loss)
+
+    def _auto_close_positions(self, sid: int, price: float, event_time: float):
+        """Automatically closes positions based on current market price hitting target or stop-loss."""
+
+        count = self.counts[sid]
+        if count == 0:
+            return
+
+        open_rows = self.positions[sid, :count]
+
+        # One vectorized, branchless pass over all open rows. With side as
+        # +1/-1, LONG target-up/stop-down and the SHORT mirror image both
+        # collapse to the same signed comparisons.
+        sign = open_rows['side']
+        hit = (sign * (price - open_rows['target']) >= 0) | (sign * (open_rows['stop'] - price) >= 0)
+        if not hit.any():
+            return
+
+        closed = open_rows[hit]  # copies the closed rows out
+        pnls = closed['side'] * (price - closed['entry'])
+
+        # Single-writer update: no lock needed, position closes only ever
+        # happen in the positions manager process.
+        self.realized_pnl.value += pnls.sum()
+
+        # Compact survivors to the front with a single boolean-index copy.
+        survivors = open_rows[~hit]
+        open_rows[:len(survivors)] = survivors
+        self.counts[sid] = len(survivors)
+
+        # Append the closed rows to the shared-memory trade log: plain
+        # field-sliced writes, then publish by bumping the count once.
+        base = self.trade_count.value
+        n = min(len(closed), MAX_TRADES - base)
+        if n < len(closed):
+            log.info("[PositionsManager] Trade log full, dropping %d trades", len(closed) - n)
+        rows = self.trades[base:base + n]
+        rows['sid'] = sid
+        rows['side'] = closed['side'][:n]
+        rows['entry'] = closed['entry'][:n]
+        rows['exit'] = price
+        rows['pnl'] = pnls[:n]
+        rows['entry_time'] = closed['open_time'][:n]
+        rows['exit_time'] = event_time
+        self.trade_count.value = base + n
+
+        identifier = self.symbols[sid]
+        for row, pnl in zip(closed, pnls):
+            log.info("[CLOSE] %s %s exited at %.2f (entry: %.2f, PnL: %.2f)",
+                     identifier, _SIDE_NAMES[int(row['side'])], price, row['entry'], pnl)
+
+    def _calculate_pnl(self, side: int, entry: float, exit: float) -> float:
+        return side * (exit - entry)
+
+    def get_trade_log(self) -> list:
+        """Formats the shared-memory trade log for reporting (cold path)."""
+        return [
+            {
+                "identifier": self.symbols[int(row['sid'])],
+                "side": _SIDE_NAMES[int(row['side'])],
+                "entry": float(row['entry']),
+                "exit": float(row['exit']),
+                "pnl": float(row['pnl']),
+                "entry_time": float(row['entry_time']),
+                "exit_time": float(row['exit_time']),
+            }
+            for row in self.trades[:self.trade_count.value]
+        ]
+
+    def get_realized_pnl(self) -> float:
+        return self.realized_pnl.value
+
+    def close(self):
+        self.shm.close()
+
+    def unlink(self):
+        if self._owner:
+            self.shm.unlink()
@@ -0,0 +1,179 @@
+import struct
+import time
+from multiprocessing import shared_memory
+
+# Header layout inside the shared memory block. The producer cursor (tail)
+# and consumer cursor (head) each get their own cache line so the producer
+# and consumer processes never write to the same line (no false sharing).
+CACHE_LINE = 64
+_TAIL_OFFSET = 0
+_HEAD_OFFSET = CACHE_LINE
+_DATA_OFFSET = 2 * CACHE_LINE
+
+_CURSOR = struct.Struct('<Q')
+
+
+class SPSCRing:
+    """
+    Lock-free single-producer single-consumer ring buffer over shared memory.
+
+    One process pushes fixed-size records, exactly one other process pops
+    them. Cursors are 8-byte aligned unsigned ints written by a single owner
+    each (producer writes tail, consumer writes head), so plain stores are
+    safe without any lock. Capacity must be a power of two so slot indexing
+    is a cheap bitwise AND.
+    """
+
+    def __init__(self, slot_size: int, capacity: int, name: str = None):
+        if capacity & (capacity - 1) != 0:
+            raise ValueError("capacity must be a power of two")
+
+        self.slot_size = slot_size
+        self.capacity = capacity
+        self.mask = capacity - 1
+
+        size = _DATA_OFFSET + slot_size * capacity
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self._owner = True
+            # Zero the cursors so a fresh ring starts empty.
+            self.shm.buf[:_DATA_OFFSET] = bytes(_DATA_OFFSET)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self._owner = False
+        self.name = self.shm.name
+
+    # -- pickling: child processes reattach to the same segment by name --
+    def __getstate__(self):
+        return (self.slot_size, self.capacity, self.name)
+
+    def __setstate__(self, state):
+        slot_size, capacity, name = state
+        self.__init__(slot_size, capacity, name=name)
+
+    def _load(self, offset: int) -> int:
+        return _CURSOR.unpack_from(self.shm.buf, offset)[0]
+
+    def _store(self, offset: int, value: int):
+        _CURSOR.pack_into(self.shm.buf, offset, value)
+
+    # -- producer side --
+    def try_push(self, record: bytes) -> bool:
+        """Writes one record. Returns False if the ring is full."""
+        tail = self._load(_TAIL_OFFSET)
+        if tail - self._load(_HEAD_OFFSET) >= self.capacity:
+            return False
+        start = _DATA_OFFSET + (tail & self.mask) * self.slot_size
+        self.shm.buf[start:start + self.slot_size] = record
+        # Publish after the slot is written.
+        self._store(_TAIL_OFFSET, tail + 1)
+        return True
+
+    def push(self, record: bytes, spin_wait: float = 0.0001):
+        """Writes one record, spinning briefly whenever the ring is full."""
+        while not self.try_push(record):
+            time.sleep(spin_wait)
+
+    # -- consumer side --
+    def try_pop(self) -> bytes:
+        """Reads one record, or returns None if the ring is empty."""
+        head = self._load(_HEAD_OFFSET)
+        if head == self._load(_TAIL_OFFSET):
+            return None
+        start = _DATA_OFFSET + (head & self.mask) * self.slot_size
+        record = bytes(self.shm.buf[start:start + self.slot_size])
+        self._store(_HEAD_OFFSET, head + 1)
+        return record
+
+    def close(self):
+        self.shm.close()
+
+    def unlink(self):
+        if self._owner:
+            self.shm.unlink()
+
+
+class BroadcastRing:
+    """
+    Single-producer multi-consumer broadcast ring (LMAX Disruptor style).
+
+    One process writes each record once; every consumer tracks its own read
+    cursor and sees every record, so broadcast needs no intermediate hop and
+    no per-consumer copy by the producer. Each cursor lives on its own cache
+    line and has exactly one writer, so plain stores suffice. The producer
+    only overwrites a slot once the slowest consumer has moved past it.
+    """
+
+    def __init__(self, slot_size: int, capacity: int, n_consumers: int, name: str = None):
+        if capacity & (capacity - 1) != 0:
+            raise ValueError("capacity must be a power of two")
+
+        self.slot_size = slot_size
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.n_consumers = n_consumers
+
+        # Producer cursor on the first cache line, one line per consumer
+        # cursor after it, then the slots.
+        self._data_offset = (1 + n_consumers) * CACHE_LINE
+        size = self._data_offset + slot_size * capacity
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self._owner = True
+            self.shm.buf[:self._data_offset] = bytes(self._data_offset)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self._owner = False
+        self.name = self.shm.name
+
+    def __getstate__(self):
+        return (self.slot_size, self.capacity, self.n_consumers, self.name)
+
+    def __setstate__(self, state):
+        slot_size, capacity, n_consumers, name = state
+        self.__init__(slot_size, capacity, n_consumers, name=name)
+
+    def _load(self, offset: int) -> int:
+        return _CURSOR.unpack_from(self.shm.buf, offset)[0]
+
+    def _store(self, offset: int, value: int):
+        _CURSOR.pack_into(self.shm.buf, offset, value)
+
+    def _min_consumer_cursor(self) -> int:
+        return min(self._load((1 + c) * CACHE_LINE) for c in range(self.n_consumers))
+
+    # -- producer side --
+    def try_push(self, record: bytes) -> bool:
+        """Writes one record. Returns False while the slowest consumer lags a full lap."""
+        tail = self._load(0)
+        if tail - self._min_consumer_cursor() >= self.capacity:
+            return False
+        start = self._data_offset + (tail & self.mask) * self.slot_size
+        self.shm.buf[start:start + self.slot_size] = record
+        # Publish after the slot is written.
+        self._store(0, tail + 1)
+        return True
+
+    def push(self, record: bytes, spin_wait: float = 0.0001):
+        """Writes one record, spinning briefly whenever the ring is full."""
+        while not self.try_push(record):
+            time.sleep(spin_wait)
+
+    # -- consumer side --
+    def try_pop(self, consumer: int) -> bytes:
+        """Reads the next record for the given consumer, or None when caught up."""
+        offset = (1 + consumer) * CACHE_LINE
+        head = self._load(offset)
+        if head == self._load(0):
+            return None
+        start = self._data_offset + (head & self.mask) * self.slot_size
+        record = bytes(self.shm.buf[start:start + self.slot_size])
+        self._store(offset, head + 1)
+        return record
+
+    def close(self):
+        self.shm.close()
+
+    def unlink(self):
+        if self._owner:
+            self.shm.unlink()
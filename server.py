@@ -1,55 +1,98 @@
-import socket
-import time
-import json
-import pandas as pd
-from datetime import datetime
-
-HOST = '127.0.0.1'  # localhost
-PORT = 65432        # any free port
-
-# Load raw CSV — no cleaning
-df_NIFTY_CE250500_31072025 = pd.read_csv('option_data.csv')
-
-# Ensure rows stream oldest to newest
-df_NIFTY_CE250500_31072025['DATE '] = pd.to_datetime(df_NIFTY_CE250500_31072025['DATE '], format='%d-%b-%Y')
-df_NIFTY_CE250500_31072025['EXPIRY DATE '] = pd.to_datetime(df_NIFTY_CE250500_31072025['EXPIRY DATE '], format='%d-%b-%Y')
-df_NIFTY_CE250500_31072025['SYMBOL '] = "NIFTY_CE250500_31072025"
-df_NIFTY_CE250500_31072025 = df_NIFTY_CE250500_31072025.sort_values(by='DATE ')
-
-# Start TCP server
-print(f"[SERVER] Starting server on {HOST}:{PORT}...")
-time.sleep(5)
-
-with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
-    server.bind((HOST, PORT))
-    server.listen(1)
-    print(f"[SERVER] Listening on {HOST}:{PORT}...")
-    time.sleep(5)
-
-    conn, addr = server.accept()
-    print(f"[SERVER] Connected to {addr}")
-
-    with conn:
-        ctr = 1
-        for _, row in df_NIFTY_CE250500_31072025.iterrows():
-            data = row.to_dict()
-
-            # Replace 'DATE' with the current timestamp
-            data['REC DATE '] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            data['DATE '] = data['DATE '].strftime('%Y-%m-%d')
-            data['EXPIRY DATE '] = data['EXPIRY DATE '].strftime('%Y-%m-%d')
-
-            # Convert to JSON string and send
-            message = json.dumps(data) + '\n'
-            conn.sendall(message.encode('utf-8'))
-
-            #print(f"[SERVER] Sent: {message.strip()}")
-            print(f"[SERVER] Data id {ctr} shared at {data['DATE ']}")
-            ctr += 1
-            time.sleep(3)  # stream one tick per minute
-
-        # Send end of data signal
-        
-        conn.sendall(b'EOD')  # Indicate end of stream
-        print("[SERVER] End of data stream sent.")
-        time.sleep(5)  # Allow time for the client to process EOD
+import argparse
+import socket
+import time
+import json
+import pandas as pd
+from datetime import datetime
+
+# orjson serializes several times faster than the stdlib and emits bytes
+# directly; fall back to the stdlib when it isn't installed.
+try:
+    from orjson import dumps as json_dumps
+except ImportError:
+    def json_dumps(obj, _dumps=json.dumps):
+        return _dumps(obj).encode('utf-8')
+
+HOST = '127.0.0.1'  # localhost
+PORT = 65432        # any free port
+
+parser = argparse.ArgumentParser(description='Streams the option data feed over TCP.')
+parser.add_argument('--tick-interval', type=float, default=0.0,
+                    help='seconds to sleep between ticks (0 = full-speed replay)')
+args = parser.parse_args()
+
+# Outgoing rows accumulate here and go out in one sendall per flush —
+# one syscall per batch instead of one per row.
+SEND_BUFFER_SIZE = 64 * 1024
+
+# Load raw CSV — no cleaning
+df_NIFTY_CE250500_31072025 = pd.read_csv('option_data.csv')
+
+# Ensure rows stream oldest to newest
+df_NIFTY_CE250500_31072025['DATE '] = pd.to_datetime(df_NIFTY_CE250500_31072025['DATE '], format='%d-%b-%Y')
+df_NIFTY_CE250500_31072025['EXPIRY DATE '] = pd.to_datetime(df_NIFTY_CE250500_31072025['EXPIRY DATE '], format='%d-%b-%Y')
+df_NIFTY_CE250500_31072025['SYMBOL '] = "NIFTY_CE250500_31072025"
+df_NIFTY_CE250500_31072025 = df_NIFTY_CE250500_31072025.sort_values(by='DATE ')
+
+# Everything in a row except REC DATE is invariant, so serialize each row
+# to JSON once at startup with a marker where the timestamp goes; sending
+# becomes a byte splice instead of a full encode per tick. itertuples
+# yields plain tuples — no per-row Series or dict materialization by
+# pandas — and the dict is assembled once here from the column list.
+cols = list(df_NIFTY_CE250500_31072025.columns)
+templates = []
+for row in df_NIFTY_CE250500_31072025.itertuples(index=False, name=None):
+    rec = dict(zip(cols, row))
+    rec['DATE '] = rec['DATE '].strftime('%Y-%m-%d')
+    rec['EXPIRY DATE '] = rec['EXPIRY DATE '].strftime('%Y-%m-%d')
+    rec['REC DATE '] = '__TS__'
+    prefix, suffix = json_dumps(rec).split(b'"__TS__"')
+    templates.append((prefix, suffix + b'\n', rec['DATE ']))
+
+# Start TCP server
+print(f"[SERVER] Starting server on {HOST}:{PORT}...")
+time.sleep(5)
+
+with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+    server.bind((HOST, PORT))
+    server.listen(1)
+    print(f"[SERVER] Listening on {HOST}:{PORT}...")
+    time.sleep(5)
+
+    conn, addr = server.accept()
+    print(f"[SERVER] Connected to {addr}")
+
+    with conn:
+        # Batching is explicit and user-controlled, so turn Nagle off.
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        buf = bytearray()
+        ctr = 1
+        for prefix, suffix, date in templates:
+            # Splice the current timestamp into the pre-serialized row and
+            # append it to the send buffer; flush once it fills up.
+            ts = datetime.now().strftime('%Y-%m-%d %H:%M:%S').encode()
+            buf += prefix + b'"' + ts + b'"' + suffix
+            if len(buf) >= SEND_BUFFER_SIZE:
+                conn.sendall(buf)
+                buf.clear()
+
+            #print(f"[SERVER] Sent: {message.strip()}")
+            print(f"[SERVER] Data id {ctr} shared at {date}")
+            ctr += 1
+
+            # While pacing is on, ship the row before sleeping so ticks
+            # still go out on schedule; at full speed, let the batches fill.
+            if args.tick_interval:
+                if buf:
+                    conn.sendall(buf)
+                    buf.clear()
+                time.sleep(args.tick_interval)
+
+        # Send end of data signal
+        if buf:
+            conn.sendall(buf)
+            buf.clear()
+        conn.sendall(b'EOD')  # Indicate end of stream
+        print("[SERVER] End of data stream sent.")
+        time.sleep(5)  # Allow time for the client to process EOD
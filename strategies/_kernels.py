@@ -0,0 +1,22 @@
+"""
+Shared JIT plumbing for the strategy batch kernels.
+
+Numba is optional: when it is installed the kernels are compiled to native
+code, otherwise they run as plain Python over the same numpy arrays.
+Signals are returned as int8 codes (+1 = BUY, -1 = SELL, 0 = none).
+"""
+
+# Numeric signal codes shared by every strategy; process() and the batch
+# kernels return these directly, so no string mapping sits on the tick path.
+BUY = 1
+SELL = -1
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is optional
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        def wrap(func):
+            return func
+        return wrap
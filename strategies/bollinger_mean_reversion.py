@@ -1,39 +1,133 @@
-from collections import deque
+import numpy as np
+
+from strategies._kernels import BUY, SELL, njit
+
+
+@njit(cache=True, fastmath=True)
+def _bollinger_batch(closes, buf, idx, count, sum_x, sum_x2, window_size, num_std_dev,
+                     signals, targets, stops):
+    """Runs the Bollinger update over a whole batch of closes, keeping the
+    rolling window in a preallocated circular buffer with running moments."""
+    for t in range(closes.shape[0]):
+        price = closes[t]
+
+        if count == window_size:
+            old = buf[idx]
+            sum_x -= old
+            sum_x2 -= old * old
+        else:
+            count += 1
+        buf[idx] = price
+        idx = (idx + 1) % window_size
+        sum_x += price
+        sum_x2 += price * price
+
+        if count < window_size:
+            continue  # not enough data
+
+        mean = sum_x / window_size
+        var = sum_x2 / window_size - mean * mean
+        std_dev = var ** 0.5 if var > 0.0 else 0.0
+        upper = mean + num_std_dev * std_dev
+        lower = mean - num_std_dev * std_dev
+
+        if price > upper:
+            signals[t] = SELL
+            targets[t] = mean
+            stops[t] = upper + std_dev
+        elif price < lower:
+            signals[t] = BUY
+            targets[t] = mean
+            stops[t] = lower - std_dev
+
+    return idx, count, sum_x, sum_x2
+
+
+@njit(cache=True, fastmath=True)
+def _bollinger_step(price, buf, idx, count, sum_x, sum_x2, window_size, num_std_dev):
+    """Single-tick Bollinger update on the same circular-buffer state as
+    the batch kernel. Returns (signal, target, stop, idx, count, sum_x, sum_x2)."""
+    if count == window_size:
+        old = buf[idx]
+        sum_x -= old
+        sum_x2 -= old * old
+    else:
+        count += 1
+    buf[idx] = price
+    idx = (idx + 1) % window_size
+    sum_x += price
+    sum_x2 += price * price
+
+    signal = 0
+    target = 0.0
+    stop = 0.0
+    if count == window_size:
+        mean = sum_x / window_size
+        var = sum_x2 / window_size - mean * mean
+        std_dev = var ** 0.5 if var > 0.0 else 0.0
+        upper = mean + num_std_dev * std_dev
+        lower = mean - num_std_dev * std_dev
+
+        if price > upper:
+            signal = SELL
+            target = mean
+            stop = upper + std_dev
+        elif price < lower:
+            signal = BUY
+            target = mean
+            stop = lower - std_dev
+
+    return signal, target, stop, idx, count, sum_x, sum_x2
+
 
 class Bollinger_Mean_Reversion:
     def __init__(self, window_size=20, num_std_dev=2):
         self.window_size = window_size
         self.num_std_dev = num_std_dev
-        self.prices = deque(maxlen=window_size)
-        self.num_ticks = 0
+        # Rolling-window state shared by the scalar and batch kernels
+        self._buf = np.zeros(window_size, np.float64)
+        self._idx = 0
+        self._count = 0
+        self._sum_x = 0.0
+        self._sum_x2 = 0.0
+
+    def process_batch(self, closes, opens, volumes, open_interests, changes_in_oi, is_ce):
+        """
+        Evaluates a whole batch of ticks in one kernel call. Returns
+        (signals, targets, stops) arrays; signals are +1 BUY / -1 SELL / 0.
+        """
+        n = closes.shape[0]
+        signals = np.zeros(n, np.int8)
+        targets = np.zeros(n, np.float64)
+        stops = np.zeros(n, np.float64)
+        self._idx, self._count, self._sum_x, self._sum_x2 = _bollinger_batch(
+            closes, self._buf, self._idx, self._count, self._sum_x, self._sum_x2,
+            self.window_size, self.num_std_dev, signals, targets, stops,
+        )
+        return signals, targets, stops
 
-    def process(self, last_close):
+    def process(
+        self,
+        close_price,
+        date,
+        expiry,
+        option_type,
+        open_price,
+        volume,
+        open_interest,
+        change_in_oi
+    ):
         try:
-            price = float(last_close)  # assuming format: "SYMBOL,PRICE"
+            price = float(close_price)
         except Exception as e:
             print(f"[Bollinger_Mean_Reversion] Error processing price: {e}")
             return None
-        
-        self.prices.append(last_close)
-        self.num_ticks += 1
-
-        if self.num_ticks < self.window_size:
-            return None  # not enough data
 
-        mean = sum(self.prices) / self.window_size
-        std_dev = (sum((x - mean) ** 2 for x in self.prices) / self.window_size) ** 0.5
-        upper = mean + self.num_std_dev * std_dev
-        lower = mean - self.num_std_dev * std_dev
-
-        signal = None
-        target = mean
-        stop_loss = None
-
-        if price > upper:
-            signal = "SELL"
-            stop_loss = upper + std_dev
-        elif price < lower:
-            signal = "BUY"
-            stop_loss = lower - std_dev
-
-        return signal, target, stop_loss
\ No newline at end of file
+        (signal, target, stop_loss, self._idx, self._count,
+         self._sum_x, self._sum_x2) = _bollinger_step(
+            price, self._buf, self._idx, self._count, self._sum_x, self._sum_x2,
+            self.window_size, self.num_std_dev,
+        )
+        if signal == 0:
+            return None
+        return signal, target, stop_loss
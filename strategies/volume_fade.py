@@ -1,80 +1,184 @@
-from collections import deque
-from datetime import datetime
-
-class Volume_Fade:
-    def __init__(self, volume_window=10, min_gap_percent=0.05):
-        self.volume_window = volume_window
-        self.min_gap_percent = min_gap_percent
-        self.volumes = deque(maxlen=volume_window)
-        self.num_ticks = 0
-        self.prev_open = None
-        self.prev_close = None
-
-    def process(
-        self,
-        close_price,
-        date,
-        expiry,
-        option_type,
-        open_price,
-        volume,
-        open_interest,
-        change_in_oi
-    ):
-        try:
-            #days_to_expiry = (expiry - date).days
-            open_p = float(open_price)
-            close_p = float(close_price)
-            vol = float(volume)
-            #oi = float(open_interest)
-            coi = float(change_in_oi)
-        except Exception as e:
-            print(f"[OptionVolumeFade] Error parsing inputs: {e}")
-            return None
-
-        self.volumes.append(vol)
-        self.num_ticks += 1
-
-        if self.num_ticks < self.volume_window or self.prev_close is None:
-            self.prev_open = open_p
-            self.prev_close = close_p
-            return None
-
-        avg_vol = sum(self.volumes) / self.volume_window
-        std_vol = (sum((v - avg_vol) ** 2 for v in self.volumes) / self.volume_window) ** 0.5
-        vol_z = (vol - avg_vol) / std_vol if std_vol > 0 else 0
-
-        # Check for gap up
-        min_gap = self.prev_close * self.min_gap_percent
-        is_gap_up = open_p > self.prev_close + min_gap
-
-        signal = None
-
-        if (
-            close_p > open_p and                                         # Green candle
-            (close_p - open_p) / open_p > 0.1 and                        # Candle size > 10%
-            vol_z < -1.5 and                                              # Not high volume
-            #days_to_expiry <= 10 and
-            coi <= 0 and                                                # No long buildup
-            option_type == "CE" and
-            self.prev_close > self.prev_open and                        # Previous candle green
-            is_gap_up                                                   # Gap up open
-        ):
-            target = self.prev_close                                    # Mean reversion to prev close
-            stop_loss = close_p + (close_p - open_p)
-            reward = close_p - target
-            risk = stop_loss - close_p
-            rr_ratio = reward / risk if risk > 0 else 0
-
-            if rr_ratio > 1.5:
-                signal = "SELL"
-                # Update for next tick
-                self.prev_open = open_p
-                self.prev_close = close_p
-                return signal, target, stop_loss
-
-        # Update for next tick
-        self.prev_open = open_p
-        self.prev_close = close_p
-
-        return None
+import numpy as np
+
+from strategies._kernels import BUY, SELL, njit
+
+
+@njit(cache=True, fastmath=True)
+def _volume_fade_batch(closes, opens, volumes, changes_in_oi, is_ce,
+                       buf, idx, count, sum_v, sum_v2, prev_open, prev_close,
+                       volume_window, min_gap_percent, signals, targets, stops):
+    """Runs the volume-fade update over a whole batch of ticks, keeping the
+    rolling volume window in a preallocated circular buffer."""
+    for t in range(closes.shape[0]):
+        open_p = opens[t]
+        close_p = closes[t]
+        vol = volumes[t]
+        coi = changes_in_oi[t]
+
+        if count == volume_window:
+            old = buf[idx]
+            sum_v -= old
+            sum_v2 -= old * old
+        else:
+            count += 1
+        buf[idx] = vol
+        idx = (idx + 1) % volume_window
+        sum_v += vol
+        sum_v2 += vol * vol
+
+        if count < volume_window or np.isnan(prev_close):
+            prev_open = open_p
+            prev_close = close_p
+            continue
+
+        # Cheap, selective filters first: only a green CE candle with no
+        # long buildup can fire, so skip all the variance math otherwise.
+        if (
+            is_ce[t] == 1 and
+            coi <= 0 and                                                # No long buildup
+            close_p > open_p and                                        # Green candle
+            (close_p - open_p) / open_p > 0.1 and                       # Candle size > 10%
+            prev_close > prev_open and                                  # Previous candle green
+            open_p > prev_close + prev_close * min_gap_percent          # Gap up open
+        ):
+            avg_vol = sum_v / volume_window
+            var = sum_v2 / volume_window - avg_vol * avg_vol
+            std_vol = var ** 0.5 if var > 0.0 else 0.0
+            vol_z = (vol - avg_vol) / std_vol if std_vol > 0 else 0.0
+
+            if vol_z < -1.5:                                            # Not high volume
+                target = prev_close                                     # Mean reversion to prev close
+                stop_loss = close_p + (close_p - open_p)
+                reward = close_p - target
+                risk = stop_loss - close_p
+                rr_ratio = reward / risk if risk > 0 else 0.0
+
+                if rr_ratio > 1.5:
+                    signals[t] = SELL
+                    targets[t] = target
+                    stops[t] = stop_loss
+
+        prev_open = open_p
+        prev_close = close_p
+
+    return idx, count, sum_v, sum_v2, prev_open, prev_close
+
+
+@njit(cache=True, fastmath=True)
+def _volume_fade_step(close_p, open_p, vol, coi, is_ce,
+                      buf, idx, count, sum_v, sum_v2, prev_open, prev_close,
+                      volume_window, min_gap_percent):
+    """Single-tick volume-fade update on the same circular-buffer state as
+    the batch kernel. Returns (signal, target, stop, ...updated state)."""
+    if count == volume_window:
+        old = buf[idx]
+        sum_v -= old
+        sum_v2 -= old * old
+    else:
+        count += 1
+    buf[idx] = vol
+    idx = (idx + 1) % volume_window
+    sum_v += vol
+    sum_v2 += vol * vol
+
+    signal = 0
+    target = 0.0
+    stop_loss = 0.0
+    # Cheap, selective filters first (see _volume_fade_batch): skip the
+    # variance math entirely unless the candle can possibly fire.
+    if (
+        count == volume_window and not np.isnan(prev_close) and
+        is_ce == 1 and
+        coi <= 0 and                                                    # No long buildup
+        close_p > open_p and                                            # Green candle
+        (close_p - open_p) / open_p > 0.1 and                           # Candle size > 10%
+        prev_close > prev_open and                                      # Previous candle green
+        open_p > prev_close + prev_close * min_gap_percent              # Gap up open
+    ):
+        avg_vol = sum_v / volume_window
+        var = sum_v2 / volume_window - avg_vol * avg_vol
+        std_vol = var ** 0.5 if var > 0.0 else 0.0
+        vol_z = (vol - avg_vol) / std_vol if std_vol > 0 else 0.0
+
+        if vol_z < -1.5:                                                # Not high volume
+            t = prev_close                                              # Mean reversion to prev close
+            sl = close_p + (close_p - open_p)
+            reward = close_p - t
+            risk = sl - close_p
+            rr_ratio = reward / risk if risk > 0 else 0.0
+
+            if rr_ratio > 1.5:
+                signal = SELL
+                target = t
+                stop_loss = sl
+
+    prev_open = open_p
+    prev_close = close_p
+
+    return signal, target, stop_loss, idx, count, sum_v, sum_v2, prev_open, prev_close
+
+
+class Volume_Fade:
+    def __init__(self, volume_window=10, min_gap_percent=0.05):
+        self.volume_window = volume_window
+        self.min_gap_percent = min_gap_percent
+        # Rolling-window state shared by the scalar and batch kernels
+        self._buf = np.zeros(volume_window, np.float64)
+        self._idx = 0
+        self._count = 0
+        self._sum_v = 0.0
+        self._sum_v2 = 0.0
+        self._prev_open = np.nan
+        self._prev_close = np.nan
+
+    def process_batch(self, closes, opens, volumes, open_interests, changes_in_oi, is_ce):
+        """
+        Evaluates a whole batch of ticks in one kernel call. Returns
+        (signals, targets, stops) arrays; signals are +1 BUY / -1 SELL / 0.
+        """
+        n = closes.shape[0]
+        signals = np.zeros(n, np.int8)
+        targets = np.zeros(n, np.float64)
+        stops = np.zeros(n, np.float64)
+        (self._idx, self._count, self._sum_v, self._sum_v2,
+         self._prev_open, self._prev_close) = _volume_fade_batch(
+            closes, opens, volumes, changes_in_oi, is_ce,
+            self._buf, self._idx, self._count, self._sum_v, self._sum_v2,
+            self._prev_open, self._prev_close,
+            self.volume_window, self.min_gap_percent, signals, targets, stops,
+        )
+        return signals, targets, stops
+
+    def process(
+        self,
+        close_price,
+        date,
+        expiry,
+        option_type,
+        open_price,
+        volume,
+        open_interest,
+        change_in_oi
+    ):
+        try:
+            #days_to_expiry = (expiry - date).days
+            open_p = float(open_price)
+            close_p = float(close_price)
+            vol = float(volume)
+            #oi = float(open_interest)
+            coi = float(change_in_oi)
+        except Exception as e:
+            print(f"[OptionVolumeFade] Error parsing inputs: {e}")
+            return None
+
+        is_ce = 1 if option_type == "CE" else 0
+        (signal, target, stop_loss, self._idx, self._count, self._sum_v, self._sum_v2,
+         self._prev_open, self._prev_close) = _volume_fade_step(
+            close_p, open_p, vol, coi, is_ce,
+            self._buf, self._idx, self._count, self._sum_v, self._sum_v2,
+            self._prev_open, self._prev_close,
+            self.volume_window, self.min_gap_percent,
+        )
+        if signal == 0:
+            return None
+        return signal, target, stop_loss